@@ -23,13 +23,10 @@ async def get_metadata(
         service = FinanceService(db)
         
         # Get currencies and categories
-        currencies_data = await service.get_currencies()
+        currencies = await service.get_currency_infos()
         asset_categories = await service.get_asset_categories()
         credit_categories = await service.get_credit_categories()
         
-        # Convert to proper schema format
-        currencies = [CurrencyInfo(**currency) for currency in currencies_data]
-        
         return MetadataResponse(
             currencies=currencies,
             asset_categories=asset_categories,
@@ -47,8 +44,7 @@ async def get_currencies(
     """Get list of supported currencies."""
     try:
         service = FinanceService(db)
-        currencies_data = await service.get_currencies()
-        return [CurrencyInfo(**currency) for currency in currencies_data]
+        return await service.get_currency_infos()
     except Exception as e:
         logger.error(f"Error fetching currencies: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -3,18 +3,17 @@
 import logging
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import NullPool
 from sqlalchemy import text
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Create async engine
+# Create async engine. The default async queue pool keeps connections open
+# between requests (pre-ping and recycle only apply to a pooled engine).
 engine = create_async_engine(
     settings.database_url,
     echo=settings.database_echo,
-    poolclass=NullPool,  # Use NullPool for async
     pool_pre_ping=True,
     pool_recycle=300,
 )
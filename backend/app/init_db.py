@@ -47,14 +47,15 @@ async def init_default_data():
         service = FinanceService(session)
         
         # Create default asset and credit types
-        await service.ensure_default_asset_types()
-        await service.ensure_default_credit_types()
+        await service.ensure_default_types()
         
         logger.info("Default data initialized successfully!")
 
 
 async def main():
     """Main initialization function."""
+    from app.core.database import close_database
+    
     try:
         await create_tables()
         await init_default_data()
@@ -62,6 +63,9 @@ async def main():
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
         return 1
+    finally:
+        # The shared engine is pooled; release its connections before the loop closes
+        await close_database()
     return 0
 
 
@@ -84,6 +84,10 @@ class BaseModel(Base, UUIDMixin, TimestampMixin):
     
     __abstract__ = True
     
+    # Fetch server-generated timestamps in the INSERT/UPDATE itself (RETURNING)
+    # instead of expiring them and re-selecting on next access
+    __mapper_args__ = {"eager_defaults": True}
+    
     def __repr__(self) -> str:
         """String representation of the model."""
         return f"<{self.__class__.__name__}(id={self.id})>"
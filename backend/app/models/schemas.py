@@ -401,6 +401,9 @@ class ErrorResponse(BaseSchema):
 class CurrencyInfo(BaseSchema):
     """Schema for currency information."""
 
+    # Instances are shared process-wide as static metadata
+    model_config = ConfigDict(frozen=True)
+
     code: str
     name: str
     symbol: str
@@ -3,12 +3,15 @@
 import uuid
 import logging
 from decimal import Decimal
-from typing import List, Dict, Optional, TypeVar, Generic, Callable, Union
+from types import MappingProxyType
+from typing import (
+    List, Dict, Mapping, Optional, Tuple, TypeVar, Generic, Callable, Union,
+)
 from datetime import datetime, timezone
 
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, and_, func, bindparam
 
 from app.models.user import User
 from app.models.asset import Asset, AssetType
@@ -28,6 +31,7 @@ from app.models.schemas import (
     CreditCreate,
     CreditUpdate,
     CreditResponse,
+    CurrencyInfo,
 )
 from app.services.exceptions import (
     AssetNotFoundError,
@@ -48,15 +52,78 @@ CategoryBreakdown = TypeVar(
     "CategoryBreakdown", AssetCategoryBreakdown, CreditCategoryBreakdown
 )
 
+# Static metadata, built and validated once at import. It is shared by every
+# request, so it is stored read-only and getters hand out copies.
+_CURRENCY_ROWS = [
+    {"code": "USD", "name": "US Dollar", "symbol": "$"},
+    {"code": "EUR", "name": "Euro", "symbol": "€"},
+    {"code": "GBP", "name": "British Pound", "symbol": "£"},
+    {"code": "JPY", "name": "Japanese Yen", "symbol": "¥"},
+    {"code": "CAD", "name": "Canadian Dollar", "symbol": "C$"},
+    {"code": "AUD", "name": "Australian Dollar", "symbol": "A$"},
+    {"code": "CNY", "name": "Chinese Yuan", "symbol": "¥"},
+]
+SUPPORTED_CURRENCIES: Tuple[Mapping[str, str], ...] = tuple(
+    MappingProxyType(currency) for currency in _CURRENCY_ROWS
+)
+CURRENCY_INFOS: Tuple[CurrencyInfo, ...] = tuple(
+    TypeAdapter(List[CurrencyInfo]).validate_python(_CURRENCY_ROWS)
+)
+CURRENCIES_BY_CODE: Mapping[str, Mapping[str, str]] = MappingProxyType(
+    {currency["code"]: currency for currency in SUPPORTED_CURRENCIES}
+)
+ASSET_CATEGORIES: List[str] = [category for category in AssetCategory]
+CREDIT_CATEGORIES: List[str] = [category for category in CreditCategory]
+
+# System-provided (name, category) types seeded on startup
+DEFAULT_ASSET_TYPES: List[tuple[str, str]] = [
+    ("Cash", "cash"),
+    ("Stock", "stock"),
+    ("Crypto", "crypto"),
+    ("Real Estate", "real_estate"),
+    ("Bond", "bond"),
+    ("Gold", "gold"),
+    ("Silver", "silver"),
+    ("Other", "other"),
+]
+DEFAULT_CREDIT_TYPES: List[tuple[str, str]] = [
+    ("Credit Card", "credit_card"),
+    ("Loan", "loan"),
+    ("Mortgage", "mortgage"),
+    ("Line of Credit", "line_of_credit"),
+    ("Other", "other"),
+]
+
+# Lookup statements, built once and executed with bound parameters
+USER_BY_DEVICE = select(User).where(User.device_id == bindparam("device_id"))
+ASSET_TYPE_BY_CATEGORY = select(AssetType).where(
+    AssetType.category == bindparam("category")
+)
+CREDIT_TYPE_BY_CATEGORY = select(CreditType).where(
+    CreditType.category == bindparam("category")
+)
+
 
 class FinanceService:
     """Consolidated service for asset management and portfolio calculations."""
 
     def __init__(self, db_session: AsyncSession):
         self.db = db_session
+        # Lookups resolved during this service's lifetime (one request/session).
+        # Deliberately per instance: the cached ORM objects belong to this
+        # session and must not be shared with other requests.
+        self._user_cache: Dict[str, User] = {}
+        self._asset_type_cache: Dict[str, AssetType] = {}
+        self._credit_type_cache: Dict[str, CreditType] = {}
+        self._asset_types_loaded = False
+        self._credit_types_loaded = False
 
     async def _convert_to_base_currency(
-        self, amount: Decimal, from_currency: str, to_currency: str
+        self,
+        amount: Decimal,
+        from_currency: str,
+        to_currency: str,
+        rates: Optional[Dict[tuple[str, str], Optional[Decimal]]] = None,
     ) -> tuple[Decimal, Decimal]:
         """
         Convert amount from one currency to another.
@@ -65,6 +132,8 @@ class FinanceService:
             amount: Amount to convert
             from_currency: Source currency code
             to_currency: Target currency code
+            rates: Optional per-call memo of fetched rates, so a loop over many
+                items looks up each currency pair only once
 
         Returns:
             Tuple of (converted_amount, exchange_rate)
@@ -72,30 +141,37 @@ class FinanceService:
         if from_currency == to_currency:
             return amount, Decimal("1.0")
 
+        pair = (from_currency, to_currency)
+        if rates is not None and pair in rates:
+            exchange_rate = rates[pair]
+        else:
+            exchange_rate = await self._fetch_exchange_rate(from_currency, to_currency)
+            if rates is not None:
+                rates[pair] = exchange_rate
+
+        if exchange_rate:
+            converted_amount = amount * exchange_rate
+            logger.info(
+                f"Converted {amount} {from_currency} -> {converted_amount} {to_currency} @ rate {exchange_rate}"
+            )
+            return converted_amount, exchange_rate
+
+        logger.warning(
+            f"Failed to get exchange rate for {from_currency} -> {to_currency}, "
+            f"using original amount"
+        )
+        return amount, Decimal("1.0")
+
+    async def _fetch_exchange_rate(
+        self, from_currency: str, to_currency: str
+    ) -> Optional[Decimal]:
+        """Fetch an exchange rate from market data, or None on failure."""
         try:
             async with MarketDataService() as market_service:
-                exchange_rate = await market_service.get_exchange_rate(
-                    from_currency, to_currency
-                )
-
-                if exchange_rate:
-                    converted_amount = amount * exchange_rate
-                    logger.info(
-                        f"Converted {amount} {from_currency} -> {converted_amount} {to_currency} @ rate {exchange_rate}"
-                    )
-                    return converted_amount, exchange_rate
-                else:
-                    logger.warning(
-                        f"Failed to get exchange rate for {from_currency} -> {to_currency}, "
-                        f"using original amount"
-                    )
-                    return amount, Decimal("1.0")
+                return await market_service.get_exchange_rate(from_currency, to_currency)
         except Exception as e:
-            logger.error(
-                f"Error converting currency {from_currency} -> {to_currency}: {e}, "
-                f"using original amount"
-            )
-            return amount, Decimal("1.0")
+            logger.error(f"Error fetching exchange rate {from_currency} -> {to_currency}: {e}")
+            return None
 
     async def _group_and_convert_items(
         self,
@@ -118,6 +194,7 @@ class FinanceService:
         """
         grouped_items: Dict[str, List] = {}
         category_totals: Dict[str, Decimal] = {}
+        rates: Dict[tuple[str, str], Optional[Decimal]] = {}
 
         for item in items:
             category = item.category
@@ -135,7 +212,7 @@ class FinanceService:
 
             # Convert native amount to base currency once
             converted_amount, conversion_rate = await self._convert_to_base_currency(
-                native_amount, item.currency, base_currency
+                native_amount, item.currency, base_currency, rates
             )
 
             # Create response with conversion data
@@ -181,6 +258,7 @@ class FinanceService:
         category_totals: Dict[str, Decimal] = {}
         category_counts: Dict[str, int] = {}
         total_amount = Decimal("0")
+        rates: Dict[tuple[str, str], Optional[Decimal]] = {}
 
         for item in items:
             category = item.category
@@ -188,7 +266,7 @@ class FinanceService:
             # Compute native amount and convert to base currency
             native_amount = await self._compute_native_amount(item)
             converted_amount, _ = await self._convert_to_base_currency(
-                native_amount, item.currency, base_currency
+                native_amount, item.currency, base_currency, rates
             )
 
             # Update category aggregates
@@ -210,23 +288,36 @@ class FinanceService:
 
     async def _get_or_create_user(self, device_id: str) -> User:
         """Get existing user or create new one for device."""
-        result = await self.db.execute(select(User).where(User.device_id == device_id))
+        if device_id in self._user_cache:
+            return self._user_cache[device_id]
+
+        result = await self.db.execute(USER_BY_DEVICE, {"device_id": device_id})
         user = result.scalar_one_or_none()
 
         if not user:
             user = User(device_id=device_id)
             self.db.add(user)
             await self.db.commit()
-            await self.db.refresh(user)
             logger.info(f"Created new user for device: {device_id}")
 
+        self._user_cache[device_id] = user
         return user
 
     async def _get_or_create_asset_type(self, category: str) -> AssetType:
         """Get or create asset type for category."""
-        result = await self.db.execute(
-            select(AssetType).where(AssetType.category == category)
-        )
+        if not self._asset_types_loaded:
+            # Types are few and rarely change: load them all in one query
+            result = await self.db.execute(select(AssetType))
+            self._asset_type_cache.update(
+                (asset_type.category, asset_type) for asset_type in result.scalars()
+            )
+            self._asset_types_loaded = True
+        if category in self._asset_type_cache:
+            return self._asset_type_cache[category]
+
+        # Re-check before inserting: another request may have created the
+        # type since the table was loaded
+        result = await self.db.execute(ASSET_TYPE_BY_CATEGORY, {"category": category})
         asset_type = result.scalar_one_or_none()
 
         if not asset_type:
@@ -237,16 +328,26 @@ class FinanceService:
             )
             self.db.add(asset_type)
             await self.db.commit()
-            await self.db.refresh(asset_type)
             logger.info(f"Created new asset type: {category}")
 
+        self._asset_type_cache[category] = asset_type
         return asset_type
 
     async def _get_or_create_credit_type(self, category: str) -> CreditType:
         """Get or create credit type for category."""
-        result = await self.db.execute(
-            select(CreditType).where(CreditType.category == category)
-        )
+        if not self._credit_types_loaded:
+            # Types are few and rarely change: load them all in one query
+            result = await self.db.execute(select(CreditType))
+            self._credit_type_cache.update(
+                (credit_type.category, credit_type) for credit_type in result.scalars()
+            )
+            self._credit_types_loaded = True
+        if category in self._credit_type_cache:
+            return self._credit_type_cache[category]
+
+        # Re-check before inserting: another request may have created the
+        # type since the table was loaded
+        result = await self.db.execute(CREDIT_TYPE_BY_CATEGORY, {"category": category})
         credit_type = result.scalar_one_or_none()
 
         if not credit_type:
@@ -257,18 +358,43 @@ class FinanceService:
             )
             self.db.add(credit_type)
             await self.db.commit()
-            await self.db.refresh(credit_type)
             logger.info(f"Created new credit type: {category}")
 
+        self._credit_type_cache[category] = credit_type
         return credit_type
 
-    # Asset CRUD Operations
-    async def create_asset(self, device_id: str, asset_data: AssetCreate) -> uuid.UUID:
-        """Create a new asset."""
-        user = await self._get_or_create_user(device_id)
-        asset_type = await self._get_or_create_asset_type(asset_data.category)
+    async def _get_owned_item(
+        self,
+        model: Union[type[Asset], type[Credit]],
+        item_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> Optional[Union[Asset, Credit]]:
+        """
+        Load an asset or credit by primary key, scoped to its owner.
+
+        A single primary-key SELECT with no joins; the ownership check runs on
+        the loaded row.
+
+        Args:
+            model: Asset or Credit
+            item_id: Primary key of the item
+            user_id: Owner the item must belong to
+
+        Returns:
+            The item, or None if missing or owned by another user
+        """
+        item = await self.db.get(model, item_id)
+        if item is None or item.user_id != user_id:
+            return None
+        return item
 
-        asset = Asset(
+    # Asset CRUD Operations
+    @staticmethod
+    def _build_asset(
+        user: User, asset_type: AssetType, asset_data: AssetCreate
+    ) -> Asset:
+        """Build an unsaved Asset row from validated create data."""
+        return Asset(
             user_id=user.id,
             asset_type_id=asset_type.id,
             name=asset_data.name,
@@ -283,25 +409,58 @@ class FinanceService:
             last_price_update=datetime.now(timezone.utc),
         )
 
+    async def create_asset(self, device_id: str, asset_data: AssetCreate) -> uuid.UUID:
+        """Create a new asset."""
+        user = await self._get_or_create_user(device_id)
+        asset_type = await self._get_or_create_asset_type(asset_data.category)
+
+        asset = self._build_asset(user, asset_type, asset_data)
+
         self.db.add(asset)
         await self.db.commit()
-        await self.db.refresh(asset)
 
         logger.info(f"Created asset {asset.id} for user {user.id}")
         return asset.id
 
+    async def create_assets_bulk(
+        self, device_id: str, assets_data: List[AssetCreate]
+    ) -> List[uuid.UUID]:
+        """
+        Create several assets for one user in a single transaction.
+
+        The user and each distinct asset type are resolved once, and all rows
+        are inserted in one flush.
+
+        Args:
+            device_id: User device ID
+            assets_data: Assets to create
+
+        Returns:
+            IDs of the created assets, in input order
+        """
+        user = await self._get_or_create_user(device_id)
+
+        asset_types: Dict[str, AssetType] = {}
+        for category in dict.fromkeys(data.category for data in assets_data):
+            asset_types[category] = await self._get_or_create_asset_type(category)
+
+        assets = [
+            self._build_asset(user, asset_types[data.category], data)
+            for data in assets_data
+        ]
+
+        self.db.add_all(assets)
+        await self.db.commit()
+
+        logger.info(f"Created {len(assets)} assets for user {user.id}")
+        return [asset.id for asset in assets]
+
     async def get_asset_by_id(
         self, asset_id: uuid.UUID, device_id: str
     ) -> AssetResponse:
         """Get a specific asset by ID."""
         user = await self._get_or_create_user(device_id)
-
-        result = await self.db.execute(
-            select(Asset)
-            .options(selectinload(Asset.asset_type))
-            .where(and_(Asset.id == asset_id, Asset.user_id == user.id))
-        )
-        asset = result.scalar_one_or_none()
+        asset = await self._get_owned_item(Asset, asset_id, user.id)
 
         if not asset:
             raise AssetNotFoundError(f"Asset {asset_id} not found")
@@ -325,7 +484,6 @@ class FinanceService:
 
         result = await self.db.execute(
             select(Asset)
-            .options(selectinload(Asset.asset_type))
             .where(Asset.user_id == user.id)
             .order_by(Asset.created_at.desc())
         )
@@ -341,10 +499,7 @@ class FinanceService:
         """Update an existing asset."""
         user = await self._get_or_create_user(device_id)
 
-        result = await self.db.execute(
-            select(Asset).where(and_(Asset.id == asset_id, Asset.user_id == user.id))
-        )
-        asset = result.scalar_one_or_none()
+        asset = await self._get_owned_item(Asset, asset_id, user.id)
 
         if not asset:
             raise AssetNotFoundError(f"Asset {asset_id} not found")
@@ -361,10 +516,7 @@ class FinanceService:
         """Delete an asset."""
         user = await self._get_or_create_user(device_id)
 
-        result = await self.db.execute(
-            select(Asset).where(and_(Asset.id == asset_id, Asset.user_id == user.id))
-        )
-        asset = result.scalar_one_or_none()
+        asset = await self._get_owned_item(Asset, asset_id, user.id)
 
         if not asset:
             raise AssetNotFoundError(f"Asset {asset_id} not found")
@@ -394,7 +546,6 @@ class FinanceService:
 
         self.db.add(credit)
         await self.db.commit()
-        await self.db.refresh(credit)
 
         logger.info(f"Created credit {credit.id} for user {user.id}")
         return credit.id
@@ -404,13 +555,7 @@ class FinanceService:
     ) -> CreditResponse:
         """Get a specific credit by ID."""
         user = await self._get_or_create_user(device_id)
-
-        result = await self.db.execute(
-            select(Credit)
-            .options(selectinload(Credit.credit_type))
-            .where(and_(Credit.id == credit_id, Credit.user_id == user.id))
-        )
-        credit = result.scalar_one_or_none()
+        credit = await self._get_owned_item(Credit, credit_id, user.id)
 
         if not credit:
             raise CreditNotFoundError(f"Credit {credit_id} not found")
@@ -434,7 +579,6 @@ class FinanceService:
 
         result = await self.db.execute(
             select(Credit)
-            .options(selectinload(Credit.credit_type))
             .where(Credit.user_id == user.id)
             .order_by(Credit.created_at.desc())
         )
@@ -450,12 +594,7 @@ class FinanceService:
         """Update an existing credit."""
         user = await self._get_or_create_user(device_id)
 
-        result = await self.db.execute(
-            select(Credit).where(
-                and_(Credit.id == credit_id, Credit.user_id == user.id)
-            )
-        )
-        credit = result.scalar_one_or_none()
+        credit = await self._get_owned_item(Credit, credit_id, user.id)
 
         if not credit:
             raise CreditNotFoundError(f"Credit {credit_id} not found")
@@ -472,12 +611,7 @@ class FinanceService:
         """Delete a credit."""
         user = await self._get_or_create_user(device_id)
 
-        result = await self.db.execute(
-            select(Credit).where(
-                and_(Credit.id == credit_id, Credit.user_id == user.id)
-            )
-        )
-        credit = result.scalar_one_or_none()
+        credit = await self._get_owned_item(Credit, credit_id, user.id)
 
         if not credit:
             raise CreditNotFoundError(f"Credit {credit_id} not found")
@@ -532,74 +666,59 @@ class FinanceService:
     # Metadata Operations
     async def get_currencies(self) -> List[Dict[str, str]]:
         """Get list of supported currencies."""
-        currencies = [
-            {"code": "USD", "name": "US Dollar", "symbol": "$"},
-            {"code": "EUR", "name": "Euro", "symbol": "€"},
-            {"code": "GBP", "name": "British Pound", "symbol": "£"},
-            {"code": "JPY", "name": "Japanese Yen", "symbol": "¥"},
-            {"code": "CAD", "name": "Canadian Dollar", "symbol": "C$"},
-            {"code": "AUD", "name": "Australian Dollar", "symbol": "A$"},
-            {"code": "CNY", "name": "Chinese Yuan", "symbol": "¥"},
-        ]
-        return currencies
+        return [dict(currency) for currency in SUPPORTED_CURRENCIES]
+
+    async def get_currencies_by_code(self) -> Dict[str, Dict[str, str]]:
+        """Get supported currencies keyed by ISO code."""
+        return {code: dict(currency) for code, currency in CURRENCIES_BY_CODE.items()}
+
+    async def get_currency_infos(self) -> List[CurrencyInfo]:
+        """Get supported currencies as pre-validated, frozen CurrencyInfo schemas."""
+        return list(CURRENCY_INFOS)
 
     async def get_asset_categories(self) -> List[str]:
         """Get list of supported asset categories."""
-        return [category for category in AssetCategory]
+        return list(ASSET_CATEGORIES)
 
     async def get_credit_categories(self) -> List[str]:
         """Get list of supported credit categories."""
-        return [category for category in CreditCategory]
+        return list(CREDIT_CATEGORIES)
 
-    async def ensure_default_asset_types(self) -> None:
-        """Ensure default asset types exist in database."""
-        default_types = [
-            ("Cash", "cash"),
-            ("Stock", "stock"),
-            ("Crypto", "crypto"),
-            ("Real Estate", "real_estate"),
-            ("Bond", "bond"),
-            ("Gold", "gold"),
-            ("Silver", "silver"),
-            ("Other", "other"),
-            ]
-
-        for name, category in default_types:
-            result = await self.db.execute(
-                select(AssetType).where(AssetType.category == category)
-            )
-            existing = result.scalar_one_or_none()
+    async def _add_missing_default_types(
+        self, model: type, default_types: List[tuple[str, str]]
+    ) -> None:
+        """Stage the (name, category) defaults not yet stored, in one query."""
+        categories = [category for _, category in default_types]
+        result = await self.db.execute(
+            select(model.category).where(model.category.in_(categories))
+        )
+        existing = set(result.scalars())
 
-            if not existing:
-                asset_type = AssetType(name=name, category=category, is_default=True)
-                self.db.add(asset_type)
+        self.db.add_all(
+            model(name=name, category=category, is_default=True)
+            for name, category in default_types
+            if category not in existing
+        )
 
+    async def ensure_default_asset_types(self) -> None:
+        """Ensure default asset types exist in database."""
+        await self._add_missing_default_types(AssetType, DEFAULT_ASSET_TYPES)
         await self.db.commit()
         logger.info("Ensured default asset types exist")
 
     async def ensure_default_credit_types(self) -> None:
         """Ensure default credit types exist in database."""
-        default_types = [
-            ("Credit Card", "credit_card"),
-            ("Loan", "loan"),
-            ("Mortgage", "mortgage"),
-            ("Line of Credit", "line_of_credit"),
-            ("Other", "other"),
-        ]
-
-        for name, category in default_types:
-            result = await self.db.execute(
-                select(CreditType).where(CreditType.category == category)
-            )
-            existing = result.scalar_one_or_none()
-
-            if not existing:
-                credit_type = CreditType(name=name, category=category, is_default=True)
-                self.db.add(credit_type)
-
+        await self._add_missing_default_types(CreditType, DEFAULT_CREDIT_TYPES)
         await self.db.commit()
         logger.info("Ensured default credit types exist")
 
+    async def ensure_default_types(self) -> None:
+        """Ensure default asset and credit types exist, in a single commit."""
+        await self._add_missing_default_types(AssetType, DEFAULT_ASSET_TYPES)
+        await self._add_missing_default_types(CreditType, DEFAULT_CREDIT_TYPES)
+        await self.db.commit()
+        logger.info("Ensured default asset and credit types exist")
+
     async def refresh_prices(
         self,
         device_id: str,
@@ -658,6 +777,7 @@ class FinanceService:
         updated_count = 0
         failed_count = 0
         skipped_count = len(assets) - len(assets_data)  # Assets without symbols
+        refreshed_at = datetime.now(timezone.utc)  # One timestamp for the whole batch
 
         for asset in assets:
             asset_id = str(asset.id)
@@ -671,7 +791,7 @@ class FinanceService:
                 # Compute new amount and persist if changed
                 if current_amount is not None and asset.amount != current_amount:
                     asset.amount = current_amount
-                asset.last_price_update = datetime.now(timezone.utc)
+                asset.last_price_update = refreshed_at
                 updated_count += 1
                 logger.info(f"Updated asset {asset_id} amount -> {current_amount}")
             else:
@@ -1,15 +1,16 @@
 """Test configuration and fixtures."""
 
-import asyncio
 import uuid
+from functools import lru_cache
+from types import MappingProxyType
 from decimal import Decimal
 from datetime import date
-from typing import AsyncGenerator, Dict, Any
+from typing import AsyncGenerator, Dict, Any, List, Mapping, Optional, Tuple
 import pytest
 import pytest_asyncio
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.pool import StaticPool
-from sqlalchemy import event
+from sqlalchemy import event, select
 from httpx import AsyncClient
 
 from app.models.base import Base
@@ -22,18 +23,15 @@ from app.models.schemas import AssetCreate, CreditCreate, AssetCategory, CreditC
 from app.models import User, Asset, AssetType, Credit, CreditType
 
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    yield loop
-    loop.close()
-
-
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(scope="session")
 async def test_engine():
-    """Create a test database engine for each test function."""
+    """Create a single test database engine shared by the whole test session.
+
+    In-memory SQLite needs ``StaticPool`` so every checkout reuses the one
+    connection that holds the database; a queue pool would hand out fresh,
+    empty databases. Under pytest-xdist every worker is its own process and
+    therefore gets a private database without any per-worker URL.
+    """
     test_db_url = "sqlite+aiosqlite:///:memory:"
     
     engine = create_async_engine(
@@ -44,43 +42,99 @@ async def test_engine():
         future=True,
     )
     
-    # Enable foreign key support for SQLite
+    # Enable foreign key support for SQLite; the test data is throwaway, so
+    # skip journaling to disk and fsyncs should the URL ever be file-backed
     @event.listens_for(engine.sync_engine, "connect")
     def set_sqlite_pragma(dbapi_connection, connection_record):
         cursor = dbapi_connection.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
         cursor.close()
+        # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs nest correctly
+        dbapi_connection.isolation_level = None
     
-    # Create all tables
+    @event.listens_for(engine.sync_engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
+    # Create all tables once for the session
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
     yield engine
     
-    # Clean up
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-    
     await engine.dispose()
 
 
+@pytest_asyncio.fixture(scope="session")
+async def default_types(test_engine) -> None:
+    """Seed the default asset and credit types once for the whole session."""
+    async with AsyncSession(bind=test_engine, expire_on_commit=False) as session:
+        seeder = FinanceService(session)
+        await seeder.ensure_default_types()
+
+
 @pytest_asyncio.fixture(scope="function")
-async def test_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
-    """Create a test database session."""
-    async_session = async_sessionmaker(
-        bind=test_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
-    
-    async with async_session() as session:
+async def test_session(test_engine, default_types) -> AsyncGenerator[AsyncSession, None]:
+    """Create a test database session isolated by an outer transaction.
+
+    The session joins the outer transaction through a SAVEPOINT, so code under
+    test may commit freely while everything is rolled back after the test.
+    """
+    async with test_engine.connect() as conn:
+        outer = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
         try:
             yield session
-        except Exception:
-            await session.rollback()
-            raise
         finally:
             await session.close()
+            await outer.rollback()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def seeded_user_and_types(test_engine, default_types):
+    """Commit one user per test module and expose the seeded default types.
+    
+    Returns ``(user, asset_types, credit_types)`` where the type dicts are keyed
+    by category. The user is committed outside the per-test transaction, so it
+    survives each test's rollback, and is deleted when the module finishes.
+    """
+    async with AsyncSession(bind=test_engine, expire_on_commit=False) as session:
+        user = User(device_id=f"test-module-{uuid.uuid4()}")
+        session.add(user)
+        await session.commit()
+        
+        asset_types = {t.category: t for t in (await session.scalars(select(AssetType))).all()}
+        credit_types = {t.category: t for t in (await session.scalars(select(CreditType))).all()}
+        # End the read transaction: StaticPool shares one connection with the tests
+        await session.commit()
+        
+        yield user, asset_types, credit_types
+        
+        await session.delete(user)
+        await session.commit()
+
+
+@pytest.fixture
+def query_log(test_engine) -> List[str]:
+    """Record every SQL statement sent to the database during a test.
+    
+    Lets tests assert on query shape (e.g. no per-row lazy loads), not just
+    on results. Clear the list after setup to count only the code under test.
+    """
+    statements: List[str] = []
+    
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(test_engine.sync_engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(test_engine.sync_engine, "before_cursor_execute", _record)
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -103,80 +157,214 @@ async def client(test_session: AsyncSession) -> AsyncGenerator[AsyncClient, None
 
 @pytest_asyncio.fixture
 async def service(test_session: AsyncSession) -> FinanceService:
-    """Create a finance service instance."""
+    """Create a finance service instance.
+    
+    Construction only binds the per-test session (all metadata is built at
+    import), so a fresh instance per test is cheaper and safer than sharing
+    one across tests and re-pointing its session.
+    """
     return FinanceService(test_session)
 
 
+# Market data stub
+class FakeMarketDataService:
+    """Async context manager stub for MarketDataService used in tests."""
+
+    def __init__(self, prices: Dict[str, Decimal], fx: Dict[Tuple[str, str], Decimal]):
+        self._prices = prices
+        self._fx = fx
+        self.fx_calls: List[Tuple[str, str]] = []  # Every exchange-rate lookup made
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def get_stock_price(self, symbol: str) -> Optional[Decimal]:
+        return self._prices.get(symbol)
+
+    async def get_crypto_price(self, symbol: str) -> Optional[Decimal]:
+        return self._prices.get(symbol)
+
+    async def get_commodity_price(self, commodity: str) -> Optional[Decimal]:
+        # commodity keys like "gold" or "silver" intentionally allowed
+        return self._prices.get(commodity)
+
+    async def get_exchange_rate(self, from_currency: str, to_currency: str) -> Optional[Decimal]:
+        self.fx_calls.append((from_currency, to_currency))
+        if from_currency == to_currency:
+            return Decimal("1.0")
+        return self._fx.get((from_currency, to_currency))
+
+    async def update_multiple_assets(self, assets_data: List[Dict], base_currency: str = "USD"):
+        # Return tuples: (success, market_price, current_amount) in native currency
+        results = {}
+        for a in assets_data:
+            symbol = a.get("symbol")
+            shares = Decimal(str(a.get("shares", 1)))
+            price = self._prices.get(symbol)
+            if price is None:
+                results[a.get("id")] = (False, None, None)
+            else:
+                current_amount = price * shares
+                results[a.get("id")] = (True, price, current_amount)
+        return results
+
+
+@pytest.fixture
+def fake_market(monkeypatch):
+    """Install FakeMarketDataService into the finance_service module."""
+    from app.services import finance_service as fs_module
+
+    def _install(prices: Dict[str, Decimal], fx: Dict[Tuple[str, str], Decimal]):
+        fake = FakeMarketDataService(prices, fx)
+        monkeypatch.setattr(fs_module, "MarketDataService", lambda *args, **kwargs: fake)
+        return fake
+
+    return _install
+
+
+# Fixed ISO date for factory payloads; never derived from the clock so the
+# cached defaults stay constant for the whole run
+FACTORY_DATE = "2024-01-15"
+
+
+# Marks a factory argument that was not passed, so an explicit None still
+# overrides the default
+_UNSET: Any = object()
+
+
 # Test data factories
 class TestDataFactory:
     """Factory for creating consistent test data."""
     
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _defaults(kind: str) -> Mapping[str, Any]:
+        """Default payload for ``kind``, built once and shared read-only."""
+        asset = {
+            "name": "Test Asset",
+            "category": AssetCategory.CASH,
+            "amount": "1000.00",
+            "currency": Currency.USD,
+            "purchase_date": FACTORY_DATE,
+        }
+        defaults = {
+            "asset": asset,
+            "stock": {
+                **asset,
+                "name": "Apple Inc.",
+                "category": AssetCategory.STOCK,
+                "amount": "15000.00",
+                "symbol": "AAPL",
+                "shares": 100.0,
+            },
+            "credit": {
+                "name": "Test Credit",
+                "category": CreditCategory.CREDIT_CARD,
+                "amount": "500.00",
+                "currency": Currency.USD,
+                "issue_date": FACTORY_DATE,
+            },
+        }
+        return MappingProxyType(defaults[kind])
+    
+    @staticmethod
+    def _merge(kind: str, fields: Dict[str, Any], extra: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy the cached defaults for ``kind`` with the given overrides."""
+        overrides = {key: value for key, value in fields.items() if value is not _UNSET}
+        if "amount" in overrides:
+            overrides["amount"] = str(overrides["amount"])
+        return {**TestDataFactory._defaults(kind), **overrides, **extra}
+    
     @staticmethod
     def asset_data(
-        name: str = "Test Asset",
-        category: AssetCategory = AssetCategory.CASH,
-        amount: Decimal = Decimal("1000.00"),
-        currency: Currency = Currency.USD,
+        name: Optional[str] = _UNSET,
+        category: Optional[AssetCategory] = _UNSET,
+        amount: Optional[Decimal] = _UNSET,
+        currency: Optional[Currency] = _UNSET,
         **kwargs
     ) -> Dict[str, Any]:
         """Create asset test data."""
-        data = {
-            "name": name,
-            "category": category,
-            "amount": str(amount),
-            "currency": currency,
-            "purchase_date": "2024-01-15",
-        }
-        data.update(kwargs)
-        return data
+        fields = {"name": name, "category": category, "amount": amount, "currency": currency}
+        return TestDataFactory._merge("asset", fields, kwargs)
     
     @staticmethod
     def credit_data(
-        name: str = "Test Credit",
-        category: CreditCategory = CreditCategory.CREDIT_CARD,
-        amount: Decimal = Decimal("500.00"),
-        currency: Currency = Currency.USD,
+        name: Optional[str] = _UNSET,
+        category: Optional[CreditCategory] = _UNSET,
+        amount: Optional[Decimal] = _UNSET,
+        currency: Optional[Currency] = _UNSET,
         **kwargs
     ) -> Dict[str, Any]:
         """Create credit test data."""
-        data = {
-            "name": name,
-            "category": category,
-            "amount": str(amount),
-            "currency": currency,
-            "issue_date": "2024-01-15",
-        }
-        data.update(kwargs)
-        return data
+        fields = {"name": name, "category": category, "amount": amount, "currency": currency}
+        return TestDataFactory._merge("credit", fields, kwargs)
     
     @staticmethod
     def stock_asset_data(
-        name: str = "Apple Inc.",
-        symbol: str = "AAPL",
-        shares: float = 100.0,
-        amount: Decimal = Decimal("15000.00"),
+        name: Optional[str] = _UNSET,
+        symbol: Optional[str] = _UNSET,
+        shares: Optional[float] = _UNSET,
+        amount: Optional[Decimal] = _UNSET,
         **kwargs
     ) -> Dict[str, Any]:
         """Create stock asset test data."""
-        return TestDataFactory.asset_data(
-            name=name,
-            category=AssetCategory.STOCK,
-            amount=amount,
-            symbol=symbol,
-            shares=shares,
-            **kwargs
-        )
+        fields = {"name": name, "symbol": symbol, "shares": shares, "amount": amount}
+        return TestDataFactory._merge("stock", fields, kwargs)
+    
+    @staticmethod
+    def _construct(schema, data: Dict[str, Any], date_field: str):
+        """Build a schema from trusted factory data, skipping validation.
+        
+        Mirrors the coercions validation would apply (enum values, Decimal
+        amount, ISO date) so the result can be handed straight to the service.
+        Use the real constructor when the test is about validation itself.
+        """
+        values = {key: getattr(value, "value", value) for key, value in data.items()}
+        values["amount"] = Decimal(values["amount"])
+        values[date_field] = date.fromisoformat(values[date_field])
+        return schema.model_construct(**values)
+    
+    @staticmethod
+    def asset_model(*args, **kwargs) -> AssetCreate:
+        """Create an AssetCreate from asset_data without validation."""
+        data = TestDataFactory.asset_data(*args, **kwargs)
+        return TestDataFactory._construct(AssetCreate, data, "purchase_date")
+    
+    @staticmethod
+    def stock_asset_model(*args, **kwargs) -> AssetCreate:
+        """Create an AssetCreate from stock_asset_data without validation."""
+        data = TestDataFactory.stock_asset_data(*args, **kwargs)
+        return TestDataFactory._construct(AssetCreate, data, "purchase_date")
+    
+    @staticmethod
+    def credit_model(*args, **kwargs) -> CreditCreate:
+        """Create a CreditCreate from credit_data without validation."""
+        data = TestDataFactory.credit_data(*args, **kwargs)
+        return TestDataFactory._construct(CreditCreate, data, "issue_date")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def factory() -> TestDataFactory:
     """Provide test data factory."""
     return TestDataFactory
 
 
+# Pinned FX rates into USD for the sample_data rows, so expected totals do not
+# depend on live market data
+SAMPLE_RATES = MappingProxyType({"USD": Decimal("1"), "EUR": Decimal("1.1743")})
+
+
 @pytest_asyncio.fixture
-async def sample_data(service: FinanceService, factory: TestDataFactory):
-    """Create sample data for testing."""
+async def sample_data(test_session: AsyncSession, factory: TestDataFactory):
+    """Create sample data for testing.
+    
+    Rows are inserted directly as ORM objects in a single flush rather than
+    one service call (and commit) per row; the default types are already
+    seeded by the ``default_types`` fixture.
+    """
     device_id = "sample-device"
     
     # Create assets
@@ -194,23 +382,43 @@ async def sample_data(service: FinanceService, factory: TestDataFactory):
         factory.credit_data("EUR Card", CreditCategory.CREDIT_CARD, Decimal("1000.00"), Currency.EUR),
     ]
     
-    # Create in service
-    asset_ids = []
-    for data in asset_data:
-        asset_create = AssetCreate(**data)
-        asset_id = await service.create_asset(device_id, asset_create)
-        asset_ids.append(asset_id)
+    asset_type_ids = dict(
+        (await test_session.execute(select(AssetType.category, AssetType.id))).all()
+    )
+    credit_type_ids = dict(
+        (await test_session.execute(select(CreditType.category, CreditType.id))).all()
+    )
     
-    credit_ids = []
+    user = User(device_id=device_id)
+    assets = []
+    for data in asset_data:
+        values = factory._construct(AssetCreate, data, "purchase_date").model_dump()
+        assets.append(
+            Asset(user=user, asset_type_id=asset_type_ids[values["category"]], **values)
+        )
+    credits = []
     for data in credit_data:
-        credit_create = CreditCreate(**data)
-        credit_id = await service.create_credit(device_id, credit_create)
-        credit_ids.append(credit_id)
+        values = factory._construct(CreditCreate, data, "issue_date").model_dump()
+        credits.append(
+            Credit(user=user, credit_type_id=credit_type_ids[values["category"]], **values)
+        )
+    
+    test_session.add_all([user, *assets, *credits])
+    await test_session.flush()
+    
+    total_assets = sum(asset.amount * SAMPLE_RATES[asset.currency] for asset in assets)
+    total_credits = sum(credit.amount * SAMPLE_RATES[credit.currency] for credit in credits)
     
     return {
         "device_id": device_id,
-        "asset_ids": asset_ids,
-        "credit_ids": credit_ids,
+        "asset_ids": [asset.id for asset in assets],
+        "credit_ids": [credit.id for credit in credits],
         "assets": asset_data,
         "credits": credit_data,
-    }
\ No newline at end of file
+        "rates": SAMPLE_RATES,
+        "expected": {
+            "total_assets": total_assets,      # 41022.90
+            "total_credits": total_credits,    # 18174.30
+            "net_worth": total_assets - total_credits,  # 22848.60
+        },
+    }
@@ -1,6 +1,5 @@
 """API integration tests for MoneyInOne finance app."""
 
-import pytest
 import uuid
 from decimal import Decimal
 from httpx import AsyncClient
@@ -9,7 +8,8 @@ from httpx import AsyncClient
 class TestAPIIntegration:
     """Test API endpoints focusing on HTTP integration."""
     
-    @pytest.mark.asyncio
+    FAKE_ID = str(uuid.UUID(int=0))  # Never persisted; used for not-found checks
+    
     async def test_health_and_metadata_endpoints(self, client: AsyncClient):
         """Test system health and metadata endpoints."""
         # Health check
@@ -17,7 +17,7 @@ class TestAPIIntegration:
         assert response.status_code == 200
         health_data = response.json()
         assert health_data["status"] == "healthy"
-        assert all(key in health_data for key in ["app", "version"])
+        assert {"app", "version"} <= health_data.keys()
         
         # Metadata endpoint
         response = await client.get("/api/v1/metadata/")
@@ -25,7 +25,7 @@ class TestAPIIntegration:
         metadata = response.json()
         
         # Verify complete metadata structure
-        assert all(key in metadata for key in ["currencies", "asset_categories", "credit_categories"])
+        assert {"currencies", "asset_categories", "credit_categories"} <= metadata.keys()
         assert len(metadata["currencies"]) >= 7  # At least USD, EUR, GBP, JPY, CAD, AUD, CNY
         assert "stock" in metadata["asset_categories"]  # Verify our new stock category
         
@@ -33,7 +33,6 @@ class TestAPIIntegration:
         usd = next((c for c in metadata["currencies"] if c["code"] == "USD"), None)
         assert usd and usd["name"] == "US Dollar" and usd["symbol"] == "$"
     
-    @pytest.mark.asyncio
     async def test_asset_api_workflow(self, client: AsyncClient, factory):
         """Test complete asset API workflow including stock fields."""
         device_id = "test-api-assets"
@@ -80,7 +79,6 @@ class TestAPIIntegration:
         response = await client.get(f"/api/v1/assets/{asset_id}?device_id={device_id}")
         assert response.status_code == 404
     
-    @pytest.mark.asyncio
     async def test_credit_api_workflow(self, client: AsyncClient, factory):
         """Test complete credit API workflow."""
         device_id = "test-api-credits"
@@ -105,7 +103,6 @@ class TestAPIIntegration:
         response = await client.delete(f"/api/v1/credits/{credit_id}?device_id={device_id}")
         assert response.status_code == 200
     
-    @pytest.mark.asyncio
     async def test_grouped_data_endpoints(self, client: AsyncClient, factory):
         """Test grouped data retrieval via API."""
         device_id = "test-api-grouped"
@@ -160,18 +157,20 @@ class TestAPIIntegration:
         assert grouped_credits["mortgage"]["count"] == 1
         assert len(grouped_credits["mortgage"]["credits"]) == 1
     
-    @pytest.mark.asyncio
-    async def test_portfolio_summary_endpoint(self, client: AsyncClient, sample_data):
+    async def test_portfolio_summary_endpoint(
+        self, client: AsyncClient, sample_data, fake_market
+    ):
         """Test portfolio summary API endpoint."""
         device_id = sample_data["device_id"]
+        fake_market({}, {("EUR", "USD"): sample_data["rates"]["EUR"]})
         
         response = await client.get(f"/api/v1/portfolio/summary?device_id={device_id}")
         assert response.status_code == 200
         portfolio = response.json()
         
         # Verify API response structure - now uses net_worth instead of net_summary
-        required_keys = ["asset_summary", "credit_summary", "net_worth", "base_currency", "last_updated"]
-        assert all(key in portfolio for key in required_keys)
+        required_keys = {"asset_summary", "credit_summary", "net_worth", "base_currency", "last_updated"}
+        assert required_keys <= portfolio.keys()
         
         # Verify base currency
         assert portfolio["base_currency"] == "USD"
@@ -181,18 +180,14 @@ class TestAPIIntegration:
         assert portfolio["asset_summary"]["stock"]["count"] == 1
         assert portfolio["credit_summary"]["credit_card"]["count"] == 2
         
-        # Test net_worth calculation (single value in base currency)
-        # Without exchange rate service, EUR converts 1:1 to USD
-        # Assets: $5000 + €3000 ($3000) + $7500 + $25000 = $40,500
-        # Credits: $2000 + $15000 + €1000 ($1000) = $18,000
-        # Net: $22,500
-        assert float(portfolio["net_worth"]) == 22848.6
+        # Test net_worth calculation (single value in base currency), with
+        # EUR converted at the fixed sample rate
+        assert Decimal(str(portfolio["net_worth"])) == sample_data["expected"]["net_worth"]
     
-    @pytest.mark.asyncio
     async def test_api_validation_and_error_responses(self, client: AsyncClient):
         """Test API validation and error handling."""
         device_id = "test-api-validation"
-        fake_id = str(uuid.uuid4())
+        fake_id = self.FAKE_ID
 
         # Test stock field validation
         invalid_stock = {
@@ -225,7 +220,6 @@ class TestAPIIntegration:
             response = await client.delete(f"{endpoint}?device_id={device_id}")
             assert response.status_code == 404
     
-    @pytest.mark.asyncio
     async def test_device_isolation_via_api(self, client: AsyncClient, factory):
         """Test device-based data isolation through API."""
         devices = ["device-1", "device-2"]
@@ -252,7 +246,6 @@ class TestAPIIntegration:
         assert len(grouped) == 0 or all(breakdown["count"] == 0 for breakdown in grouped.values())
 
 
-@pytest.mark.asyncio
 async def test_api_response_formats(client: AsyncClient, factory):
     """Test API response formats and data serialization."""
     device_id = "test-response-format"
@@ -273,7 +266,6 @@ async def test_api_response_formats(client: AsyncClient, factory):
     assert "created_at" in created_asset
     assert "updated_at" in created_asset
 
-    @pytest.mark.asyncio
     async def test_market_data_endpoints(self, client: AsyncClient, factory):
         """Test market data refresh endpoints integrated into assets."""
         device_id = "test-market-data"
@@ -295,7 +287,7 @@ async def test_api_response_formats(client: AsyncClient, factory):
         result = response.json()
         assert "message" in result
         assert "data" in result
-        assert all(key in result["data"] for key in ["updated", "failed", "skipped"])
+        assert {"updated", "failed", "skipped"} <= result["data"].keys()
         
         # Test refresh specific assets endpoint
         response = await client.post(
@@ -316,7 +308,6 @@ async def test_api_response_formats(client: AsyncClient, factory):
         result = response.json()
         assert f"Asset {asset_id} price updated successfully" == result["message"]
 
-    @pytest.mark.asyncio
     async def test_usd_only_for_stock_crypto_on_create(self, client: AsyncClient, factory):
         """Stock/Crypto assets must use USD currency on create."""
         device_id = "test-usd-only"
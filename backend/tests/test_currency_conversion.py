@@ -8,60 +8,14 @@ These tests validate:
 
 import uuid
 from decimal import Decimal
-from typing import Optional, Dict, Tuple, List
 
-import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.finance_service import FinanceService
 from app.models.schemas import AssetCreate, AssetCategory, Currency
 
 
-class FakeMarketDataService:
-    """Async context manager stub for MarketDataService used in tests."""
-
-    def __init__(self, prices: Dict[str, Decimal], fx: Dict[Tuple[str, str], Decimal]):
-        self._prices = prices
-        self._fx = fx
-
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
-
-    async def get_stock_price(self, symbol: str) -> Optional[Decimal]:
-        return self._prices.get(symbol)
-
-    async def get_crypto_price(self, symbol: str) -> Optional[Decimal]:
-        return self._prices.get(symbol)
-
-    async def get_commodity_price(self, commodity: str) -> Optional[Decimal]:
-        # commodity keys like "gold" or "silver" intentionally allowed
-        return self._prices.get(commodity)
-
-    async def get_exchange_rate(self, from_currency: str, to_currency: str) -> Optional[Decimal]:
-        if from_currency == to_currency:
-            return Decimal("1.0")
-        return self._fx.get((from_currency, to_currency))
-
-    async def update_multiple_assets(self, assets_data: List[Dict], base_currency: str = "USD"):
-        # Return tuples: (success, market_price, current_amount) in native currency
-        results = {}
-        for a in assets_data:
-            symbol = a.get("symbol")
-            shares = Decimal(str(a.get("shares", 1)))
-            price = self._prices.get(symbol)
-            if price is None:
-                results[a.get("id")] = (False, None, None)
-            else:
-                current_amount = price * shares
-                results[a.get("id")] = (True, price, current_amount)
-        return results
-
-
-@pytest.mark.asyncio
-async def test_order_of_operations_and_currency_switch(monkeypatch, service: FinanceService):
+async def test_order_of_operations_and_currency_switch(fake_market, service: FinanceService):
     """Verify symbol×shares×price then convert; switching base currency recomputes correctly."""
     device_id = "conv-switch"
 
@@ -84,24 +38,17 @@ async def test_order_of_operations_and_currency_switch(monkeypatch, service: Fin
         purchase_date="2024-01-02",
     )
 
-    stock_id = await service.create_asset(device_id, stock)
-    _ = await service.create_asset(device_id, eur_cash)
+    await service.create_assets_bulk(device_id, [stock, eur_cash])
 
     # Provide deterministic market prices and FX
-    prices = {"AAPL": Decimal("200")}
-    fx = {
-        ("USD", "CNY"): Decimal("7.0"),
-        ("EUR", "CNY"): Decimal("8.0"),
-        ("EUR", "USD"): Decimal("1.1"),
-    }
-
-    # Patch MarketDataService in the finance_service module
-    from app.services import finance_service as fs_module
-
-    def fake_factory(*args, **kwargs):
-        return FakeMarketDataService(prices, fx)
-
-    monkeypatch.setattr(fs_module, "MarketDataService", fake_factory)
+    fake_market(
+        {"AAPL": Decimal("200")},
+        {
+            ("USD", "CNY"): Decimal("7.0"),
+            ("EUR", "CNY"): Decimal("8.0"),
+            ("EUR", "USD"): Decimal("1.1"),
+        },
+    )
 
     # Base CNY: stock 3*200*7 = 4200; EUR cash 100*8 = 800
     grouped_cny = await service.get_assets_grouped_by_category(device_id, base_currency="CNY")
@@ -114,8 +61,7 @@ async def test_order_of_operations_and_currency_switch(monkeypatch, service: Fin
     assert grouped_usd["cash"].total_amount == Decimal("110")
 
 
-@pytest.mark.asyncio
-async def test_refresh_updates_amount_to_market_value(monkeypatch, service: FinanceService):
+async def test_refresh_updates_amount_to_market_value(fake_market, service: FinanceService):
     """Refresh updates the stored amount to shares×price when market-tracked."""
     device_id = "refresh-amount"
     asset = AssetCreate(
@@ -130,15 +76,7 @@ async def test_refresh_updates_amount_to_market_value(monkeypatch, service: Fina
     )
     asset_id = await service.create_asset(device_id, asset)
 
-    prices = {"AAPL": Decimal("200")}
-    fx = {}
-
-    from app.services import finance_service as fs_module
-
-    def fake_factory(*args, **kwargs):
-        return FakeMarketDataService(prices, fx)
-
-    monkeypatch.setattr(fs_module, "MarketDataService", fake_factory)
+    fake_market({"AAPL": Decimal("200")}, {})
 
     # Run refresh; amount should become 3*200=600 (native USD)
     await service.refresh_prices(device_id, [asset_id], base_currency="USD")
@@ -148,3 +86,26 @@ async def test_refresh_updates_amount_to_market_value(monkeypatch, service: Fina
     assert updated.amount == Decimal("600")
 
 
+async def test_summary_fetches_each_rate_once(fake_market, service: FinanceService):
+    """Items sharing a currency pair reuse one exchange-rate lookup per summary."""
+    device_id = "conv-rate-once"
+
+    await service.create_assets_bulk(
+        device_id,
+        [
+            AssetCreate(
+                name=f"EUR Cash {i}",
+                category=AssetCategory.CASH,
+                amount=Decimal("100.00"),
+                currency=Currency.EUR,
+                purchase_date="2024-01-01",
+            )
+            for i in range(3)
+        ],
+    )
+
+    fake = fake_market({}, {("EUR", "USD"): Decimal("1.1")})
+
+    portfolio = await service.get_portfolio_summary(device_id, base_currency="USD")
+    assert portfolio.net_worth == Decimal("330")
+    assert fake.fx_calls == [("EUR", "USD")]
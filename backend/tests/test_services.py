@@ -4,10 +4,15 @@ import pytest
 import uuid
 from decimal import Decimal
 from datetime import date
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 import pydantic
 
-from app.services.finance_service import FinanceService
+from app.models import Asset
+from app.services.finance_service import (
+    FinanceService, SUPPORTED_CURRENCIES, CURRENCIES_BY_CODE, CURRENCY_INFOS,
+    ASSET_CATEGORIES, CREDIT_CATEGORIES,
+)
 from app.services.exceptions import AssetNotFoundError, CreditNotFoundError
 from app.models.schemas import (
     AssetCreate, AssetUpdate, CreditCreate, CreditUpdate,
@@ -15,56 +20,122 @@ from app.models.schemas import (
 )
 
 
+def cents(amount: Decimal) -> int:
+    """Convert an amount to integer cents, failing on any sub-cent remainder."""
+    scaled = amount * 100
+    assert scaled == scaled.to_integral_value(), f"{amount} has sub-cent digits"
+    return int(scaled)
+
+
+# A grouped/summary read is a user lookup plus at most two item queries (the
+# summary reads assets and credits); anything above this means a per-row
+# (N+1) query crept in
+MAX_SELECTS_PER_READ = 3
+
+
+def count_selects(statements) -> int:
+    """Count SELECT statements in a query_log."""
+    return sum(1 for sql in statements if sql.lstrip().upper().startswith("SELECT"))
+
+
+def is_single_select_without_join(statements) -> bool:
+    """Check a query_log holds exactly one SELECT and no JOIN."""
+    return count_selects(statements) == 1 and not any(
+        "JOIN" in sql.upper() for sql in statements
+    )
+
+
+# Valid partial update, validated once at import
+VALID_PARTIAL_UPDATE = AssetUpdate(name="Updated Name", shares=150.0)
+
+
+# Lifecycle and scale amounts, parsed once at import
+MSFT_AMOUNT = Decimal("22500.00")
+MSFT_UPDATED_AMOUNT = Decimal("30000.00")
+MORTGAGE_AMOUNT = Decimal("250000.00")
+MORTGAGE_UPDATED_AMOUNT = Decimal("240000.00")
+SCALE_ROW_AMOUNT = Decimal("100.01")
+
+
+# Every test rolls back its transaction, so tests that need only one user
+# can share a device ID; isolation tests still use distinct ones
+DEVICE_ID = "test-device"
+
+
 class TestFinanceService:
     """Comprehensive test suite for FinanceService."""
     
-    @pytest.mark.asyncio
-    async def test_user_and_type_management(self, service: FinanceService):
+    FAKE_ID = uuid.UUID(int=0)  # Never persisted; shared by the not-found tests
+    
+    async def test_user_and_type_management(self, service: FinanceService, query_log):
         """Test user and type creation with idempotency."""
-        device_id = "test-management"
+        device_id = DEVICE_ID
         
-        # Test idempotent operations
+        # Test idempotent operations. These stay sequential: an AsyncSession
+        # does not allow concurrent operations, so asyncio.gather would fail.
+        # The first lookups hit the database; repeats come from the service cache.
         user1 = await service._get_or_create_user(device_id)
-        user2 = await service._get_or_create_user(device_id)
-        assert user1.id == user2.id
-        
         asset_type1 = await service._get_or_create_asset_type("stock")
-        asset_type2 = await service._get_or_create_asset_type("stock")
-        assert asset_type1.id == asset_type2.id
-        assert asset_type1.name == "Stock"
-        
         credit_type1 = await service._get_or_create_credit_type("mortgage")
+        
+        query_log.clear()
+        user2 = await service._get_or_create_user(device_id)
+        asset_type2 = await service._get_or_create_asset_type("stock")
         credit_type2 = await service._get_or_create_credit_type("mortgage")
-        assert credit_type1.id == credit_type2.id
+        # The first type lookup loaded every seeded type, not just its own
+        cash_type = await service._get_or_create_asset_type("cash")
+        loan_type = await service._get_or_create_credit_type("loan")
+        assert query_log == []
+        assert cash_type.is_default and loan_type.is_default
+        
+        assert user1 is user2
+        assert asset_type1 is asset_type2
+        assert asset_type1.name == "Stock"
+        assert credit_type1 is credit_type2
         assert credit_type1.name == "Mortgage"
+        
+        # A category missing from the full load is re-checked once, then created
+        query_log.clear()
+        new_type = await service._get_or_create_asset_type("collectible")
+        assert count_selects(query_log) == 1
+        assert new_type.name == "Collectible"
+        assert await service._get_or_create_asset_type("collectible") is new_type
     
-    @pytest.mark.asyncio
-    async def test_complete_asset_lifecycle(self, service: FinanceService, factory):
+    async def test_complete_asset_lifecycle(
+        self, service: FinanceService, factory, test_session: AsyncSession, query_log
+    ):
         """Test complete asset CRUD lifecycle with stock fields."""
-        device_id = "test-asset-lifecycle"
+        device_id = DEVICE_ID
         
         # CREATE with stock fields
-        asset_data = AssetCreate(**factory.stock_asset_data(
-            "Microsoft", "MSFT", 75.0, Decimal("22500.00")
-        ))
+        asset_data = factory.stock_asset_model(
+            "Microsoft", "MSFT", 75.0, MSFT_AMOUNT
+        )
         asset_id = await service.create_asset(device_id, asset_data)
         
-        # READ and verify
+        # READ and verify; a single SELECT with no joins. Expunge first so the
+        # identity map cannot serve the row and the read always hits the DB.
+        test_session.expunge_all()
+        query_log.clear()
         asset = await service.get_asset_by_id(asset_id, device_id)
+        assert is_single_select_without_join(query_log)
         assert asset.name == "Microsoft"
         assert asset.symbol == "MSFT"
         assert asset.shares == 75.0
-        assert asset.amount == Decimal("22500.00")
+        assert asset.amount == MSFT_AMOUNT
         
         # UPDATE
         update_data = AssetUpdate(
             name="Microsoft Corp",
             shares=100.0,
-            amount=Decimal("30000.00")
+            amount=MSFT_UPDATED_AMOUNT
         )
         await service.update_asset(asset_id, device_id, update_data)
         
+        test_session.expunge_all()
+        query_log.clear()
         updated_asset = await service.get_asset_by_id(asset_id, device_id)
+        assert is_single_select_without_join(query_log)
         assert updated_asset.name == "Microsoft Corp"
         assert updated_asset.shares == 100.0
         assert updated_asset.symbol == "MSFT"  # Unchanged
@@ -74,42 +145,50 @@ class TestFinanceService:
         with pytest.raises(AssetNotFoundError):
             await service.get_asset_by_id(asset_id, device_id)
     
-    @pytest.mark.asyncio
     async def test_complete_credit_lifecycle(self, service: FinanceService, factory):
         """Test complete credit CRUD lifecycle."""
-        device_id = "test-credit-lifecycle"
+        device_id = DEVICE_ID
         
         # CREATE
-        credit_data = CreditCreate(**factory.credit_data(
-            "Home Mortgage", CreditCategory.MORTGAGE, Decimal("250000.00")
-        ))
+        credit_data = factory.credit_model(
+            "Home Mortgage", CreditCategory.MORTGAGE, MORTGAGE_AMOUNT
+        )
         credit_id = await service.create_credit(device_id, credit_data)
         
         # READ and verify
         credit = await service.get_credit_by_id(credit_id, device_id)
         assert credit.name == "Home Mortgage"
         assert credit.category == "mortgage"
-        assert credit.amount == Decimal("250000.00")
+        assert credit.amount == MORTGAGE_AMOUNT
         
         # UPDATE
-        update_data = CreditUpdate(amount=Decimal("240000.00"))
+        update_data = CreditUpdate(amount=MORTGAGE_UPDATED_AMOUNT)
         await service.update_credit(credit_id, device_id, update_data)
         
         updated_credit = await service.get_credit_by_id(credit_id, device_id)
-        assert updated_credit.amount == Decimal("240000.00")
+        assert updated_credit.amount == MORTGAGE_UPDATED_AMOUNT
         
         # DELETE
         await service.delete_credit(credit_id, device_id)
         with pytest.raises(CreditNotFoundError):
             await service.get_credit_by_id(credit_id, device_id)
     
-    @pytest.mark.asyncio
-    async def test_grouped_data_retrieval(self, service: FinanceService, sample_data):
-        """Test grouped asset and credit retrieval."""
+    async def test_grouped_and_summary_reads(
+        self, service: FinanceService, sample_data, fake_market, query_log
+    ):
+        """Test grouped retrieval and portfolio summary over one sample portfolio.
+        
+        The three reads share a single sample_data setup.
+        """
         device_id = sample_data["device_id"]
+        expected = sample_data["expected"]
+        fake_market({}, {("EUR", "USD"): sample_data["rates"]["EUR"]})
         
         # Test grouped assets - returns Dict[str, AssetCategoryBreakdown]
+        query_log.clear()
         grouped_assets = await service.get_assets_grouped_by_category(device_id)
+        assert count_selects(query_log) <= MAX_SELECTS_PER_READ
+        query_log.clear()
         assert "cash" in grouped_assets
         assert "stock" in grouped_assets
         assert "crypto" in grouped_assets
@@ -117,7 +196,7 @@ class TestFinanceService:
         # Verify AssetCategoryBreakdown structure
         cash_breakdown = grouped_assets["cash"]
         assert cash_breakdown.count == 2  # USD + EUR
-        assert len(cash_breakdown.assets) == 2
+        assert sorted(a.name for a in cash_breakdown.assets) == ["EUR Cash", "USD Cash"]
         assert cash_breakdown.total_amount > 0  # Should have converted amounts
         
         stock_breakdown = grouped_assets["stock"]
@@ -127,9 +206,12 @@ class TestFinanceService:
         stock_asset = stock_breakdown.assets[0]
         assert stock_asset.symbol == "AAPL"
         assert stock_asset.shares == 50.0
+        assert query_log == []  # Everything was loaded up front, no lazy loads
         
         # Test grouped credits - returns Dict[str, CreditCategoryBreakdown]
+        query_log.clear()
         grouped_credits = await service.get_credits_grouped_by_category(device_id)
+        assert count_selects(query_log) <= MAX_SELECTS_PER_READ
         assert "credit_card" in grouped_credits
         assert "loan" in grouped_credits
         
@@ -140,18 +222,16 @@ class TestFinanceService:
         
         loan_breakdown = grouped_credits["loan"]
         assert loan_breakdown.count == 1
-    
-    @pytest.mark.asyncio
-    async def test_portfolio_summary_calculations(self, service: FinanceService, sample_data):
-        """Test portfolio summary with complex calculations."""
-        device_id = sample_data["device_id"]
         
+        # Test portfolio summary calculations
+        query_log.clear()
         portfolio = await service.get_portfolio_summary(device_id)
+        assert count_selects(query_log) <= MAX_SELECTS_PER_READ
         
         # Verify structure - now has net_worth instead of net_summary
-        assert all(key in portfolio.__dict__ for key in [
+        assert {
             "asset_summary", "credit_summary", "net_worth", "base_currency", "last_updated"
-        ])
+        } <= portfolio.__dict__.keys()
         
         # Verify base currency
         assert portfolio.base_currency == "USD"
@@ -168,22 +248,42 @@ class TestFinanceService:
         assert credit_summary["loan"].count == 1  # Car loan
         
         # Verify net_worth is calculated (single Decimal in base currency)
-        # Note: Without mocking exchange rates, EUR amounts fallback to 1:1 conversion
-        # Assets: $5000 (USD Cash) + €3000 (EUR Cash as $3000) + $7500 (Stock) + $25000 (Bitcoin) = $40,500
-        # Credits: $2000 (Visa) + $15000 (Car Loan) + €1000 (EUR Card as $1000) = $18,000
-        # Net: $22,500
-        expected_net_worth = Decimal("22848.60")
-        assert portfolio.net_worth == expected_net_worth
+        assert cents(portfolio.net_worth) == cents(expected["net_worth"])
         
         # Verify total amounts in asset summary
         total_assets = sum(breakdown.total_amount for breakdown in asset_summary.values())
-        assert total_assets == Decimal("41022.90")
+        assert cents(total_assets) == cents(expected["total_assets"])
         
         # Verify total amounts in credit summary
         total_credits = sum(breakdown.total_amount for breakdown in credit_summary.values())
-        assert total_credits == Decimal("18174.30")
+        assert cents(total_credits) == cents(expected["total_credits"])
+    
+    @pytest.mark.parametrize("n_assets", [10, 100])
+    async def test_portfolio_summary_scales(
+        self, service: FinanceService, test_session: AsyncSession, query_log, n_assets
+    ):
+        """Test that summary queries stay constant and totals exact as rows grow."""
+        device_id = DEVICE_ID
+        user = await service._get_or_create_user(device_id)
+        cash_type = await service._get_or_create_asset_type("cash")
+        
+        await test_session.execute(insert(Asset), [
+            {
+                "user_id": user.id, "asset_type_id": cash_type.id,
+                "name": f"Cash {i}", "category": "cash",
+                "amount": SCALE_ROW_AMOUNT, "currency": "USD",
+                "purchase_date": date(2024, 1, 1),
+            }
+            for i in range(n_assets)
+        ])
+        
+        query_log.clear()
+        portfolio = await service.get_portfolio_summary(device_id)
+        assert count_selects(query_log) <= MAX_SELECTS_PER_READ
+        
+        assert portfolio.asset_summary["cash"].count == n_assets
+        assert cents(portfolio.net_worth) == cents(SCALE_ROW_AMOUNT) * n_assets
     
-    @pytest.mark.asyncio
     async def test_user_isolation_and_security(self, service: FinanceService, factory):
         """Test that users can only access their own data."""
         devices = ["user1-device", "user2-device"]
@@ -191,7 +291,7 @@ class TestFinanceService:
         
         # Create assets for different users
         for i, device_id in enumerate(devices):
-            asset_data = AssetCreate(**factory.asset_data(f"User{i+1} Asset"))
+            asset_data = factory.asset_model(f"User{i+1} Asset")
             asset_id = await service.create_asset(device_id, asset_data)
             asset_ids.append(asset_id)
         
@@ -207,49 +307,65 @@ class TestFinanceService:
         with pytest.raises(AssetNotFoundError):
             await service.get_asset_by_id(asset_ids[1], devices[0])
     
-    @pytest.mark.asyncio
-    async def test_error_handling(self, service: FinanceService):
-        """Test comprehensive error handling."""
-        device_id = "test-errors"
-        fake_id = uuid.uuid4()
-        
-        # Test all not found scenarios
-        with pytest.raises(AssetNotFoundError):
-            await service.get_asset_by_id(fake_id, device_id)
-        
-        with pytest.raises(AssetNotFoundError):
-            await service.update_asset(fake_id, device_id, AssetUpdate(name="Updated"))
+    @pytest.mark.parametrize("method_name,args,exc", [
+        pytest.param("get_asset_by_id", (), AssetNotFoundError, id="get-asset"),
+        pytest.param(
+            "update_asset", (AssetUpdate(name="Updated"),), AssetNotFoundError,
+            id="update-asset",
+        ),
+        pytest.param("delete_asset", (), AssetNotFoundError, id="delete-asset"),
+        pytest.param("get_credit_by_id", (), CreditNotFoundError, id="get-credit"),
+        pytest.param(
+            "update_credit", (CreditUpdate(name="Updated"),), CreditNotFoundError,
+            id="update-credit",
+        ),
+        pytest.param("delete_credit", (), CreditNotFoundError, id="delete-credit"),
+    ])
+    async def test_crud_missing(self, service: FinanceService, method_name, args, exc):
+        """Test not found errors for missing records."""
+        device_id = DEVICE_ID
+        
+        with pytest.raises(exc):
+            await getattr(service, method_name)(self.FAKE_ID, device_id, *args)
+    
+    async def test_metadata_is_not_shared_mutably(self, service: FinanceService):
+        """Test that mutating returned metadata cannot leak into later calls."""
+        currencies = await service.get_currencies()
+        currencies[0]["symbol"] = "x"
+        assert (await service.get_currencies())[0]["symbol"] == "$"
         
-        with pytest.raises(AssetNotFoundError):
-            await service.delete_asset(fake_id, device_id)
+        by_code = await service.get_currencies_by_code()
+        by_code["USD"]["symbol"] = "x"
+        assert (await service.get_currencies_by_code())["USD"]["symbol"] == "$"
         
-        # Same for credits
-        with pytest.raises(CreditNotFoundError):
-            await service.get_credit_by_id(fake_id, device_id)
+        info = (await service.get_currency_infos())[0]
+        with pytest.raises(pydantic.ValidationError):
+            info.symbol = "x"
     
-    @pytest.mark.asyncio
-    async def test_metadata_operations(self, service: FinanceService):
-        """Test metadata retrieval operations."""
+    def test_metadata_operations(self):
+        """Test the static currency and category metadata."""
         # Test currency metadata
-        currencies = await service.get_currencies()
-        assert len(currencies) > 0
-        usd = next((c for c in currencies if c["code"] == "USD"), None)
-        assert usd and usd["name"] == "US Dollar" and usd["symbol"] == "$"
+        assert len(SUPPORTED_CURRENCIES) > 0
+        assert all({"code", "name", "symbol"} <= c.keys() for c in SUPPORTED_CURRENCIES)
+        assert list(CURRENCIES_BY_CODE) == [c["code"] for c in SUPPORTED_CURRENCIES]
+        usd = CURRENCIES_BY_CODE["USD"]
+        assert usd["name"] == "US Dollar" and usd["symbol"] == "$"
+        assert [info.code for info in CURRENCY_INFOS] == [
+            c["code"] for c in SUPPORTED_CURRENCIES
+        ]
         
         # Test category metadata
-        asset_categories = await service.get_asset_categories()
-        assert "cash" in asset_categories
-        assert "stock" in asset_categories
-        
-        credit_categories = await service.get_credit_categories()
-        assert "credit_card" in credit_categories
-        assert "loan" in credit_categories
+        assert "cash" in ASSET_CATEGORIES
+        assert "stock" in ASSET_CATEGORIES
+        assert "credit_card" in CREDIT_CATEGORIES
+        assert "loan" in CREDIT_CATEGORIES
     
-    @pytest.mark.asyncio
-    async def test_default_types_initialization(self, service: FinanceService):
+    async def test_default_types_initialization(self, service: FinanceService, query_log):
         """Test default asset and credit types creation."""
-        await service.ensure_default_asset_types()
-        await service.ensure_default_credit_types()
+        # Seeding is idempotent: the session fixture already ran it once
+        query_log.clear()
+        await service.ensure_default_types()
+        assert count_selects(query_log) == 2  # One IN query per type table
         
         # Verify default types exist
         stock_type = await service._get_or_create_asset_type("stock")
@@ -261,46 +377,61 @@ class TestFinanceService:
         assert card_type.is_default is True
 
 
+@pytest.fixture(scope="module")
+def base_asset_data(factory):
+    """Default asset kwargs, built once per module."""
+    return factory.asset_data()
+
+
+@pytest.fixture(scope="module")
+def base_stock_data(factory):
+    """Default stock asset kwargs, built once per module."""
+    return factory.stock_asset_data()
+
+
+@pytest.fixture(scope="module")
+def base_credit_data(factory):
+    """Default credit kwargs, built once per module."""
+    return factory.credit_data()
+
+
 class TestSchemaValidation:
     """Test Pydantic schema validation."""
     
-    def test_asset_schema_validation(self, factory):
+    def test_asset_schema_validation(self, base_stock_data, base_asset_data):
         """Test comprehensive asset schema validation."""
         # Valid stock asset
-        valid_stock = AssetCreate(**factory.stock_asset_data())
+        valid_stock = AssetCreate.model_validate(base_stock_data)
         assert valid_stock.symbol == "AAPL"
         assert valid_stock.shares == 100.0
         
         # Valid non-stock asset
-        valid_cash = AssetCreate(**factory.asset_data())
+        valid_cash = AssetCreate.model_validate(base_asset_data)
         assert valid_cash.symbol is None
         assert valid_cash.shares is None
-        
-        # Test validation errors
-        with pytest.raises(pydantic.ValidationError):
-            AssetCreate(**factory.asset_data(amount="-100.00"))  # Negative amount
-        
-        with pytest.raises(pydantic.ValidationError):
-            AssetCreate(**factory.stock_asset_data(shares=-10.0))  # Negative shares
     
-    def test_credit_schema_validation(self, factory):
+    def test_credit_schema_validation(self, base_credit_data):
         """Test credit schema validation."""
         # Valid credit
-        valid_credit = CreditCreate(**factory.credit_data())
+        valid_credit = CreditCreate.model_validate(base_credit_data)
         assert valid_credit.category == CreditCategory.CREDIT_CARD
-        
-        # Test validation errors
-        with pytest.raises(pydantic.ValidationError):
-            CreditCreate(**factory.credit_data(amount="-500.00"))  # Negative amount
     
     def test_update_schema_validation(self):
         """Test update schema validation."""
         # Valid partial update
-        update = AssetUpdate(name="Updated Name", shares=150.0)
+        update = VALID_PARTIAL_UPDATE
         assert update.name == "Updated Name"
         assert update.shares == 150.0
         assert update.symbol is None  # Not provided
-        
-        # Invalid update
+    
+    @pytest.mark.parametrize("schema,base,bad", [
+        (AssetCreate, "base_asset_data", {"amount": "-100.00"}),    # Negative amount
+        (AssetCreate, "base_stock_data", {"shares": -10.0}),        # Negative shares
+        (CreditCreate, "base_credit_data", {"amount": "-500.00"}),  # Negative amount
+        (AssetUpdate, None, {"shares": -50.0}),                     # Negative shares
+    ], ids=["asset-amount", "stock-shares", "credit-amount", "update-shares"])
+    def test_negative_values_rejected(self, request, schema, base, bad):
+        """Test that schemas reject negative values."""
+        kwargs = {**request.getfixturevalue(base), **bad} if base else bad
         with pytest.raises(pydantic.ValidationError):
-            AssetUpdate(shares=-50.0)  # Negative shares
\ No newline at end of file
+            schema.model_validate(kwargs)
\ No newline at end of file